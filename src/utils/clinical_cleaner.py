@@ -6,6 +6,7 @@ Applies rule-based clinical corrections AFTER automatic matching:
 - fixes known group misclassifications
 """
 
+import numpy as np
 import pandas as pd
 
 FALSE_POSITIVE_COLUMNS = {
@@ -29,13 +30,14 @@ def clean_clinical_matches(df_matches: pd.DataFrame) -> pd.DataFrame:
     2. Apply forced group corrections
     """
 
-    df = df_matches.copy()
-    
-    df = df[~df["column"].isin(FALSE_POSITIVE_COLUMNS)]
- 
-    df["group"] = df.apply(
-        lambda row: FORCED_GROUP_OVERRIDES.get(row["column"], row["group"]),
-        axis=1
+    df = df_matches[~df_matches["column"].isin(FALSE_POSITIVE_COLUMNS)]
+
+    df = df.assign(
+        group=(
+            df["column"]
+            .map(FORCED_GROUP_OVERRIDES)
+            .fillna(df["group"])
+        )
     )
 
     return df.reset_index(drop=True)
@@ -52,32 +54,25 @@ def group_clinical_duplicates(
     Returns only duplicated columns with a duplicate_group label.
     """
 
-    df = df_matches.copy()
-
-    # Canonical form for duplication detection
-    def canonical_name(name: str) -> str:
-        name = name.lower()
-        if name.endswith("s") and len(name) > 4:
-            return name[:-1]
-        return name
-
-    df["canonical_name"] = df["normalized_name"].apply(canonical_name)
+    # Canonical form for duplication detection (drops plural "s")
+    name = df_matches["normalized_name"].str.lower()
+    is_plural = name.str.endswith("s") & (name.str.len() > 4)
+    canonical_name = name.mask(is_plural, name.str.slice(0, -1))
 
     # Duplication key
-    df["dup_key"] = (
-        df["group"].str.upper() + "__" +
-        df["canonical_name"]
-    )
-
-    # Count duplicates
-    dup_counts = (
-        df.groupby("dup_key")["column"]
-        .transform("count")
-    )
+    dup_key = df_matches["group"].str.upper() + "__" + canonical_name
 
-    df = df[dup_counts > 1].copy()
+    # Count rows per dup_key (missing keys, code -1, never count)
+    codes, uniques = pd.factorize(dup_key)
+    has_key = codes >= 0
+    key_counts = np.bincount(codes[has_key], minlength=len(uniques))
+    dup_counts = np.where(has_key, key_counts[codes], 0)
 
-    df["duplicate_group"] = df["canonical_name"]
+    df = df_matches.assign(
+        canonical_name=canonical_name,
+        dup_key=dup_key,
+        duplicate_group=canonical_name,
+    )[dup_counts > 1]
 
     return (
         df.sort_values(
@@ -100,28 +95,25 @@ def resolve_duplicate_columns(df_matches: pd.DataFrame) -> tuple[pd.DataFrame, p
     - df_removed: columns to remove (with reason)
     """
 
-    kept_records = []
-    removed_records = []
-
-    for dup_key, group_df in df_matches.groupby("dup_key"):
-
-        # Sort by missing percentage (ascending)
-        group_df = group_df.sort_values("missing_pct")
+    # Least missing first within each dup_key
+    sorted_df = df_matches.sort_values(
+        ["dup_key", "missing_pct"],
+        kind="stable"
+    )
 
-        # Best column = least missing
-        best_row = group_df.iloc[0]
-        kept_records.append(best_row)
+    is_best = ~sorted_df.duplicated("dup_key", keep="first")
 
-        # Remaining are duplicates to remove
-        for _, row in group_df.iloc[1:].iterrows():
-            removed_records.append({
-                **row.to_dict(),
-                "kept_column": best_row["column"],
-                "kept_missing_pct": best_row["missing_pct"],
-                "removal_reason": "higher_missing_pct"
-            })
+    df_kept = sorted_df[is_best]
+    best_by_key = df_kept.set_index("dup_key")
 
-    df_kept = pd.DataFrame(kept_records).reset_index(drop=True)
-    df_removed = pd.DataFrame(removed_records).reset_index(drop=True)
+    df_removed = sorted_df[~is_best]
+    df_removed = df_removed.assign(
+        kept_column=df_removed["dup_key"].map(best_by_key["column"]),
+        kept_missing_pct=df_removed["dup_key"].map(best_by_key["missing_pct"]),
+        removal_reason="higher_missing_pct",
+    )
 
-    return df_kept, df_removed
\ No newline at end of file
+    return (
+        df_kept.reset_index(drop=True),
+        df_removed.reset_index(drop=True),
+    )
@@ -8,8 +8,11 @@ Identifies clinical variables using:
 - prefix-based clinical rules
 - missing data penalties
 """
-from difflib import SequenceMatcher
+import re
+
+import numpy as np
 import pandas as pd
+from rapidfuzz import fuzz, process
 
 from utils.name_normalizer import normalize_column_name
 from utils.clinical_vocab import (
@@ -25,7 +28,7 @@ FORBIDDEN_PREFIXES = (
     "ID_",
 )
 
-FORBIDDEN_TOKENS = {
+FORBIDDEN_TOKENS = frozenset({
     "ID",
     "RESUL",
     "RESULT",
@@ -38,13 +41,72 @@ FORBIDDEN_TOKENS = {
     "AGRAVO",
     "BAINF",
     "FHD",
+})
+
+VOCAB_GROUPS = [
+    ("SYMPTOM", SYMPTOMS),
+    ("ALARM", ALARM_SIGNS),
+    ("SEVERITY", SEVERITY_SIGNS),
+    ("COMORBIDITY", COMORBIDITIES),
+]
+
+# Vocabularies are matched against lowercased tokens; lower them once
+_VOCAB_LOWER = {
+    group_name: {
+        concept: [v.lower() for v in variants]
+        for concept, variants in vocab.items()
+    }
+    for group_name, vocab in VOCAB_GROUPS
 }
 
 
-def similarity(a: str, b: str) -> float:
-    if not a or not b:
-        return 0.0
-    return SequenceMatcher(None, a, b).ratio()
+def _flatten_vocabularies(
+    groups: dict[str, dict[str, list[str]]],
+) -> tuple[list[str], list[str], dict[str, slice]]:
+    """
+    Flattens grouped vocabularies into parallel variant / concept arrays.
+
+    Each group occupies a contiguous span of the arrays; positions give
+    the original concept / variant order, used to break ties.
+    """
+    variants = []
+    concepts = []
+    spans = {}
+
+    for group_name, vocab in groups.items():
+        start = len(variants)
+        for concept, group_variants in vocab.items():
+            for variant in group_variants:
+                variants.append(variant)
+                concepts.append(concept)
+        spans[group_name] = slice(start, len(variants))
+
+    return variants, concepts, spans
+
+
+VARIANTS_ARR, VARIANT_TO_CONCEPT, GROUP_SPANS = _flatten_vocabularies(_VOCAB_LOWER)
+
+_GROUP_VARIANTS = {
+    group_name: VARIANTS_ARR[span]
+    for group_name, span in GROUP_SPANS.items()
+}
+
+
+def _exact_variant_index(variants: list[str]) -> dict[str, int]:
+    """
+    Maps each variant to its first position.
+    """
+    index = {}
+    for pos, variant in enumerate(variants):
+        index.setdefault(variant, pos)
+    return index
+
+
+# Exact token hits skip fuzzy scoring entirely
+_EXACT_VARIANTS = {
+    group_name: _exact_variant_index(variants)
+    for group_name, variants in _GROUP_VARIANTS.items()
+}
 
 
 def infer_group_by_prefix(column_name: str) -> str | None:
@@ -60,29 +122,109 @@ def infer_group_by_prefix(column_name: str) -> str | None:
 
 
 def contains_forbidden_token(tokens: list[str]) -> bool:
-    tokens_upper = {t.upper() for t in tokens}
-    return bool(tokens_upper & FORBIDDEN_TOKENS)
+    return any(t.upper() in FORBIDDEN_TOKENS for t in tokens)
 
 
-def best_vocab_match(texts: list[str], vocab: dict) -> tuple[str | None, float]:
+def vocab_tokens(texts: list[str]) -> list[str]:
     """
-    Returns best matching concept using token-level similarity.
+    Splits texts into unique tokens, keeping first-seen order.
+    """
+    # Duplicated tokens cannot change the best score
+    return list(dict.fromkeys(
+        token for text in texts for token in text.split("_")
+    ))
+
+
+def _best_variant(
+    tokens: list[str],
+    variants: list[str],
+    exact: dict[str, int],
+    min_score: float,
+) -> tuple[int | None, float]:
+    """
+    Returns the position of the best scoring variant and its score.
+
+    A token equal to a variant is a perfect match and returns at once.
+    Otherwise all (token, variant) pairs are scored in one cdist call;
+    pairs below min_score (in [0, 1]) are cut off early by rapidfuzz.
+    """
+    hits = [exact[token] for token in tokens if token in exact]
+
+    if hits:
+        return min(hits), 1.0
+
+    if not variants:
+        return None, 0.0
+
+    scores = process.cdist(
+        tokens,
+        variants,
+        scorer=fuzz.ratio,
+        # Slightly below min_score so float rounding never drops a kept score
+        score_cutoff=max(min_score * 100 - 1e-6, 0.0),
+        dtype=np.float64,
+    ).max(axis=0)
+
+    best = int(scores.argmax())
+    best_score = float(scores[best]) / 100.0
+
+    if best_score <= 0.0:
+        return None, 0.0
+
+    return best, best_score
+
+
+def _best_group_match(
+    tokens: list[str],
+    group_name: str,
+    min_score: float,
+) -> tuple[str | None, float]:
+    """
+    best_vocab_match over one of the precomputed VOCAB_GROUPS,
+    for tokens already split by vocab_tokens.
+    """
+    pos, score = _best_variant(
+        tokens,
+        _GROUP_VARIANTS[group_name],
+        _EXACT_VARIANTS[group_name],
+        min_score,
+    )
+
+    if pos is None:
+        return None, 0.0
+
+    return VARIANT_TO_CONCEPT[GROUP_SPANS[group_name].start + pos], score
+
+
+def best_vocab_match(
+    texts: list[str],
+    vocab: dict,
+    min_score: float = 0.0,
+) -> tuple[str | None, float]:
     """
-    best_concept = None
-    best_score = 0.0
+    Returns best matching concept using token-level similarity.
 
-    for concept, variants in vocab.items():
-        for variant in variants:
-            v = variant.lower()
+    Scores below min_score (in [0, 1]) are cut off early and never
+    reported as a match.
+    """
+    variants, concepts, _ = _flatten_vocabularies({
+        "": {
+            concept: [v.lower() for v in group_variants]
+            for concept, group_variants in vocab.items()
+        }
+    })
+
+    pos, score = _best_variant(
+        vocab_tokens(texts),
+        variants,
+        _exact_variant_index(variants),
+        min_score,
+    )
 
-            for text in texts:
-                for token in text.split("_"):
-                    score = similarity(token, v)
-                    if score > best_score:
-                        best_score = score
-                        best_concept = concept
+    if pos is None:
+        return None, 0.0
 
-    return best_concept, best_score
+    return concepts[pos], score
 
 
 def match_clinical_columns(
@@ -101,62 +243,82 @@ def match_clinical_columns(
     - missing_pct
     """
 
-    records = []
+    # At most one match per (column, group): fill preallocated columns
+    max_matches = len(df.columns) * len(VOCAB_GROUPS)
+    columns_out = np.empty(max_matches, dtype=object)
+    names_out = np.empty(max_matches, dtype=object)
+    groups_out = np.empty(max_matches, dtype=object)
+    scores_out = np.empty(max_matches, dtype=np.float64)
+    missing_out = np.empty(max_matches, dtype=np.float64)
+    n_matches = 0
+
+    # Columns without a known missing rate default to 0; repeated labels
+    # keep their first rate so reindex never sees a duplicate axis
+    missing_map = (
+        missing_by_col["missing_pct"]
+        .groupby(level=0)
+        .first()
+        .reindex(df.columns)
+        .fillna(0.0)
+        .to_dict()
+    )
 
-    for col in df.columns:
+    # Object dtype keeps .str usable on an empty frame's RangeIndex
+    columns = pd.Index(df.columns, dtype=object)
+    columns_upper = columns.str.upper()
 
-        col_upper = col.upper()
+    # Hard block by prefix
+    is_candidate = ~columns_upper.str.startswith(FORBIDDEN_PREFIXES)
+    candidate_cols = columns[is_candidate]
+    candidate_upper = columns_upper[is_candidate]
 
-        # Hard block by prefix
-        if col_upper.startswith(FORBIDDEN_PREFIXES):
-            continue
+    norms = [normalize_column_name(col) for col in candidate_cols]
 
-        norm = normalize_column_name(col)
+    for col, col_upper, norm in zip(candidate_cols, candidate_upper, norms):
 
-        base_name = norm.get("base_name", "")
-        semantic_tokens = norm.get("semantic_tokens", [])
+        base_name = norm.base_name
+        semantic_tokens = norm.semantic_tokens
 
         # Block administrative / lab columns by tokens
         if contains_forbidden_token(semantic_tokens):
             continue
 
+        semantic_lower = [t.lower() for t in semantic_tokens]
+
         texts_to_compare = [
-            base_name.lower(),
+            "_".join(semantic_lower),
             col.lower(),
-            *[t.lower() for t in semantic_tokens],
+            *semantic_lower,
         ]
 
-        try:
-            missing_pct = float(missing_by_col.loc[col, "missing_pct"])
-        except Exception:
-            missing_pct = 0.0
+        missing_pct = float(missing_map[col])
+
+        forced_group = infer_group_by_prefix(col_upper)
 
-        forced_group = infer_group_by_prefix(col)
+        tokens = vocab_tokens(texts_to_compare)
 
-        for group_name, vocab in [
-            ("SYMPTOM", SYMPTOMS),
-            ("ALARM", ALARM_SIGNS),
-            ("SEVERITY", SEVERITY_SIGNS),
-            ("COMORBIDITY", COMORBIDITIES),
-        ]:
+        for group_name, _ in VOCAB_GROUPS:
             # Respect SINAN hierarchy
             if forced_group and group_name != forced_group:
                 continue
 
-            concept, score = best_vocab_match(texts_to_compare, vocab)
+            concept, score = _best_group_match(
+                tokens,
+                group_name,
+                min_score=similarity_threshold,
+            )
 
             if not concept or score < similarity_threshold:
                 continue
 
-            records.append({
-                "column": col,
-                "normalized_name": base_name,
-                "group": group_name,                
-                "similarity_score": round(score, 3),
-                "missing_pct": round(missing_pct, 2),
-            })
+            columns_out[n_matches] = col
+            names_out[n_matches] = base_name
+            groups_out[n_matches] = group_name
+            scores_out[n_matches] = round(score, 3)
+            missing_out[n_matches] = round(missing_pct, 2)
+            n_matches += 1
 
-    if not records:
+    if n_matches == 0:
         return pd.DataFrame(
             columns=[
                 "column",
@@ -168,7 +330,13 @@ def match_clinical_columns(
         )
 
     return (
-        pd.DataFrame(records)
+        pd.DataFrame({
+            "column": columns_out[:n_matches],
+            "normalized_name": names_out[:n_matches],
+            "group": groups_out[:n_matches],
+            "similarity_score": scores_out[:n_matches],
+            "missing_pct": missing_out[:n_matches],
+        })
         .sort_values(
             ["group", "column", "similarity_score"],
             ascending=[True, True, False]
@@ -176,95 +344,92 @@ def match_clinical_columns(
         .reset_index(drop=True)
     )
 
+GROUP_PRIORITY = {
+    "SEVERITY": 3,
+    "ALARM": 2,
+    "SYMPTOM": 1,
+    "COMORBIDITY": 0,
+}
+
+COMORBIDITY_KEYWORDS = (
+    "RENAL",
+    "DIABET",
+    "AUTO",
+    "HEPAT",
+    "HEMATO",
+    "HIPERT",
+    "CARDIO",
+    "PULMON",
+    "NEURO",
+    "IMUNO",
+)
+
+SYMPTOM_KEYWORDS = (
+    "DOR",
+    "FEBRE",
+    "CEFA",
+    "MIAL",
+    "ARTR",
+    "NAUSE",
+    "VOM",
+    "EXANT",
+    "PETE",
+    "CONJUNT",
+    "LEUCO",
+)
+
+_COMORBIDITY_RE = re.compile("|".join(map(re.escape, COMORBIDITY_KEYWORDS)))
+_SYMPTOM_RE = re.compile("|".join(map(re.escape, SYMPTOM_KEYWORDS)))
+
+
 def resolve_group_conflicts(df_matches: pd.DataFrame) -> pd.DataFrame:
     """
     Resolves cases where the same column is matched to multiple clinical groups.
     Ensures exactly ONE final group per column using deterministic clinical rules.
+
+    Rules, in order of precedence:
+    1. GRAV_ columns keep SEVERITY
+    2. ALRM_ columns keep ALARM
+    3. comorbidity keywords keep COMORBIDITY
+    4. symptom keywords keep SYMPTOM
+    5. otherwise highest group priority, then highest similarity
     """
 
-    GROUP_PRIORITY = {
-        "SEVERITY": 3,
-        "ALARM": 2,
-        "SYMPTOM": 1,
-        "COMORBIDITY": 0,
-    }
+    column_upper = df_matches["column"].str.upper()
+    normalized_upper = df_matches["normalized_name"].str.upper()
+    group = df_matches["group"]
 
-    COMORBIDITY_KEYWORDS = (
-        "RENAL",
-        "DIABET",
-        "AUTO",
-        "HEPAT",
-        "HEMATO",
-        "HIPERT",
-        "CARDIO",
-        "PULMON",
-        "NEURO",
-        "IMUNO",
+    has_comorbidity_kw = (
+        column_upper.str.contains(_COMORBIDITY_RE)
+        | normalized_upper.str.contains(_COMORBIDITY_RE)
     )
-
-    SYMPTOM_KEYWORDS = (
-        "DOR",
-        "FEBRE",
-        "CEFA",
-        "MIAL",
-        "ARTR",
-        "NAUSE",
-        "VOM",
-        "EXANT",
-        "PETE",
-        "CONJUNT",
-        "LEUCO",
+    has_symptom_kw = (
+        column_upper.str.contains(_SYMPTOM_RE)
+        | normalized_upper.str.contains(_SYMPTOM_RE)
     )
 
-    resolved_rows = []
-
-    for column, df_col in df_matches.groupby("column"):
-
-        if df_col["group"].nunique() == 1:
-            resolved_rows.append(df_col.iloc[0])
-            continue
+    # Rank of the clinical rule satisfied by each row (0 = none)
+    rule_rank = np.select(
+        [
+            column_upper.str.startswith("GRAV_") & (group == "SEVERITY"),
+            column_upper.str.startswith("ALRM_") & (group == "ALARM"),
+            has_comorbidity_kw & (group == "COMORBIDITY"),
+            has_symptom_kw & (group == "SYMPTOM"),
+        ],
+        [4, 3, 2, 1],
+        default=0,
+    )
 
-        column_upper = column.upper()
-        normalized_name = df_col.iloc[0]["normalized_name"].upper()
-        
-        if column_upper.startswith("GRAV_"):
-            row = df_col[df_col["group"] == "SEVERITY"]
-            if not row.empty:
-                resolved_rows.append(row.iloc[0])
-                continue
+    # Rules dominate group priority, which dominates similarity (<= 1)
+    effective_priority = (
+        rule_rank * 100
+        + group.map(GROUP_PRIORITY).fillna(0) * 10
+        + df_matches["similarity_score"]
+    )
 
-        if column_upper.startswith("ALRM_"):
-            row = df_col[df_col["group"] == "ALARM"]
-            if not row.empty:
-                resolved_rows.append(row.iloc[0])
-                continue
-        
-        if any(k in column_upper or k in normalized_name for k in COMORBIDITY_KEYWORDS):
-            row = df_col[df_col["group"] == "COMORBIDITY"]
-            if not row.empty:
-                resolved_rows.append(row.iloc[0])
-                continue
-        
-        if any(k in column_upper or k in normalized_name for k in SYMPTOM_KEYWORDS):
-            row = df_col[df_col["group"] == "SYMPTOM"]
-            if not row.empty:
-                resolved_rows.append(row.iloc[0])
-                continue
-        
-        df_tmp = df_col.copy()
-        df_tmp["group_priority"] = df_tmp["group"].map(GROUP_PRIORITY)
-
-        resolved_rows.append(
-            df_tmp
-            .sort_values(
-                ["group_priority", "similarity_score"],
-                ascending=[False, False]
-            )
-            .iloc[0]
-        )
+    best_idx = effective_priority.groupby(df_matches["column"]).idxmax()
 
     return (
-        pd.DataFrame(resolved_rows)
-        .drop(columns=["group_priority"], errors="ignore")
+        df_matches.loc[best_idx]
         .reset_index(drop=True)
     )
@@ -148,7 +148,7 @@ def check_binary_pattern(
         })
 
     return (
-        pd.DataFrame(records)
+        pd.DataFrame(records, columns=["column", "unique_values", "status"])
         .sort_values("status")
         .reset_index(drop=True)
     )
\ No newline at end of file
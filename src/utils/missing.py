@@ -13,8 +13,51 @@ The functions in this module are domain-agnostic and can be reused
 across different datasets and projects.
 """
 
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except ImportError:  # optional: only speeds up wide float frames
+    njit = None
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _nan_count(values):
+        """
+        Counts NaN in a 1-D array without materializing a boolean mask.
+        """
+        count = 0
+        for i in prange(values.shape[0]):
+            if values[i] != values[i]:
+                count += 1
+        return count
+
+
+def _count_missing(df: pd.DataFrame) -> pd.Series:
+    """
+    Counts missing values per column.
+
+    Frames made only of float64 columns use a parallel Numba kernel
+    when numba is installed; everything else goes through isna().
+    The kernel runs on each column's own array, so no frame-wide
+    matrix is ever copied, however the frame is split into blocks.
+    """
+    if (
+        njit is not None
+        and df.shape[1] > 0
+        and (df.dtypes == np.float64).all()
+    ):
+        counts = [
+            _nan_count(df.iloc[:, j].to_numpy())
+            for j in range(df.shape[1])
+        ]
+        return pd.Series(counts, index=df.columns, dtype=np.int64)
+
+    return df.isna().sum()
+
 
 def calculate_missing_by_col(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -27,7 +70,7 @@ def calculate_missing_by_col(df: pd.DataFrame) -> pd.DataFrame:
     if len(df) == 0:
         raise ValueError("DataFrame is empty")
 
-    missing = df.isna().sum().to_frame(name="missing_count")
+    missing = _count_missing(df).to_frame(name="missing_count")
     missing["missing_pct"] = missing["missing_count"] / len(df) * 100
 
     return missing.sort_values("missing_pct", ascending=False)
@@ -61,12 +104,23 @@ def add_missing_ranges(
     if len(labels) != len(bins) - 1:
         raise ValueError("labels must have length len(bins) - 1")
 
+    edges = np.asarray(bins, dtype=np.float64)
+    if np.any(np.diff(edges) <= 0):
+        raise ValueError("bins must increase monotonically")
+
+    values = missing_df["missing_pct"].to_numpy(dtype=np.float64)
+
+    # Right-closed bins (a, b], with the first one also closed on the left,
+    # as pd.cut(..., include_lowest=True); out of range / NaN -> code -1
+    codes = np.searchsorted(edges, values, side="left") - 1
+    codes[values == edges[0]] = 0
+    codes[(codes < 0) | (codes >= len(labels))] = -1
+
     df = missing_df.copy()
-    df["missing_range"] = pd.cut(
-        df["missing_pct"],
-        bins=bins,
-        labels=labels,
-        include_lowest=True
+    df["missing_range"] = pd.Categorical.from_codes(
+        codes,
+        categories=labels,
+        ordered=True
     )
 
     return df
\ No newline at end of file
@@ -1,16 +1,34 @@
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import List, NamedTuple, Tuple
 
 """
 Utilities for morphological normalization of column names.
 This module extracts structural and semantic components
 without performing domain-specific interpretation."""
 
+_CLEAN_RE = re.compile(r"[^A-Z_]")
+
+ADMIN_PREFIXES = {"DT", "NU", "ID", "CS", "TP", "SG", "NM", "DS"}
+
+
+class NormalizedName(NamedTuple):
+    """
+    Immutable decomposition of a column name (safe to cache and share).
+    """
+    original: str
+    cleaned: str
+    raw_tokens: Tuple[str, ...]
+    semantic_tokens: Tuple[str, ...]
+    structural_tokens: Tuple[str, ...]
+    base_name: str
+
+
 def _clean_column_name(name: str) -> str:
     """
     Remove non-alphabetic characters and normalize to uppercase.
     """
-    return re.sub(r"[^A-Z_]", "", name.upper())
+    return _CLEAN_RE.sub("", name.upper())
 
 
 def _tokenize(name: str) -> List[str]:
@@ -20,7 +38,8 @@ def _tokenize(name: str) -> List[str]:
     return [t for t in name.split("_") if t]
 
 
-def normalize_column_name(column_name: str) -> Dict:
+@lru_cache(maxsize=4096)
+def normalize_column_name(column_name: str) -> NormalizedName:
     """
     Decompose a column name into structural and semantic components.
 
@@ -30,7 +49,6 @@ def normalize_column_name(column_name: str) -> Dict:
     - Structural suffixes are single-letter tokens at the end (N, I, H, V).
     - All remaining tokens are semantic, including short clinical abbreviations.
     """
-
     original = column_name
     cleaned = _clean_column_name(column_name)
     tokens = _tokenize(cleaned)
@@ -39,22 +57,20 @@ def normalize_column_name(column_name: str) -> Dict:
     semantic_tokens: List[str] = []
 
     if not tokens:
-        return {
-            "original": original,
-            "cleaned": cleaned,
-            "raw_tokens": [],
-            "semantic_tokens": [],
-            "structural_tokens": [],
-            "base_name": "",
-        }
+        return NormalizedName(
+            original=original,
+            cleaned=cleaned,
+            raw_tokens=(),
+            semantic_tokens=(),
+            structural_tokens=(),
+            base_name="",
+        )
 
     # --- Handle suffixes (_N, _I, _H, _V)
     if len(tokens[-1]) == 1:
         structural_tokens.append(tokens.pop())
 
     # --- Handle prefixes (administrative only)
-    ADMIN_PREFIXES = {"DT", "NU", "ID", "CS", "TP", "SG", "NM", "DS"}
-
     if len(tokens) > 1 and tokens[0] in ADMIN_PREFIXES:
         structural_tokens.append(tokens.pop(0))
 
@@ -63,11 +79,11 @@ def normalize_column_name(column_name: str) -> Dict:
 
     base_name = "_".join(semantic_tokens)
 
-    return {
-        "original": original,
-        "cleaned": cleaned,
-        "raw_tokens": semantic_tokens + structural_tokens,
-        "semantic_tokens": semantic_tokens,
-        "structural_tokens": structural_tokens,
-        "base_name": base_name,
-    }
\ No newline at end of file
+    return NormalizedName(
+        original=original,
+        cleaned=cleaned,
+        raw_tokens=tuple(semantic_tokens + structural_tokens),
+        semantic_tokens=tuple(semantic_tokens),
+        structural_tokens=tuple(structural_tokens),
+        base_name=base_name,
+    )
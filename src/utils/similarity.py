@@ -16,15 +16,100 @@ This module is intended to support:
 It should NOT be used for clinical or semantic interpretation.
 """
 
-from difflib import SequenceMatcher
 from itertools import combinations
+
+import numpy as np
 import pandas as pd
+from rapidfuzz import fuzz, process
 from utils.name_normalizer import normalize_column_name
 
+SIMILARITY_BACKENDS = ("rapidfuzz", "difflib_fast")
+
+
 def column_name_similarity(a: str, b: str) -> float:
-    a_norm = normalize_column_name(a)
-    b_norm = normalize_column_name(b)
-    return SequenceMatcher(None, a_norm, b_norm).ratio()
+    a_norm = normalize_column_name(a).base_name
+    b_norm = normalize_column_name(b).base_name
+    return fuzz.ratio(a_norm, b_norm) / 100.0
+
+
+def _similar_name_pairs(
+    names: list[str],
+    similarity_threshold: float,
+    backend: str = "rapidfuzz"
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns index pairs (i < j) of names whose similarity reaches the
+    threshold, together with their similarity in [0, 1].
+
+    The "rapidfuzz" backend computes the full Indel similarity matrix in
+    a single parallel call and keeps its upper triangle, matching
+    column_name_similarity. The "difflib_fast" backend groups names by
+    single-linkage clustering and scores only pairs inside a cluster with
+    the Ratcliff-Obershelp ratio, so its results differ.
+    """
+    if backend not in SIMILARITY_BACKENDS:
+        raise ValueError(
+            f"backend must be one of {SIMILARITY_BACKENDS}, got {backend!r}"
+        )
+
+    if backend == "difflib_fast":
+        return _clustered_name_pairs(names, similarity_threshold)
+
+    matrix = process.cdist(
+        names,
+        names,
+        scorer=fuzz.ratio,
+        # Slightly below the threshold so float rounding never drops a pair
+        score_cutoff=max(similarity_threshold * 100 - 1e-6, 0.0),
+        dtype=np.float64,
+        workers=-1,
+    )
+
+    rows, cols = np.triu_indices(len(names), k=1)
+    scores = matrix[rows, cols] / 100.0
+    keep = scores >= similarity_threshold
+
+    return rows[keep], cols[keep], scores[keep]
+
+
+def _clustered_name_pairs(
+    names: list[str],
+    similarity_threshold: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    difflib_fast backend of _similar_name_pairs.
+
+    Every pair reaching the threshold is linked, so it always falls
+    inside one cluster; pairs of a cluster are re-scored because
+    single-linkage members are not all pairwise similar.
+    """
+    import difflib_fast
+
+    clusters = difflib_fast.cluster_canonicals(names, similarity_threshold)
+
+    pairs = [
+        pair
+        for members, _ in clusters
+        for pair in combinations(sorted(members), 2)
+    ]
+
+    if not pairs:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, np.empty(0, dtype=np.float64)
+
+    idx = np.asarray(pairs, dtype=np.intp)
+    scores = np.asarray(
+        difflib_fast.ratio([(names[i], names[j]) for i, j in pairs]),
+        dtype=np.float64,
+    )
+
+    # Same pair order as the upper-triangle scan
+    order = np.lexsort((idx[:, 1], idx[:, 0]))
+    idx = idx[order]
+    scores = scores[order]
+    keep = scores >= similarity_threshold
+
+    return idx[keep, 0], idx[keep, 1], scores[keep]
 
 
 def find_suspected_duplicate_columns(
@@ -32,7 +117,8 @@ def find_suspected_duplicate_columns(
     df: pd.DataFrame,
     missing_df: pd.DataFrame,
     similarity_threshold: float = 0.75,
-    missing_threshold: float = 95
+    missing_threshold: float = 95,
+    backend: str = "rapidfuzz"
 ) -> pd.DataFrame:
     """
     Identify pairs of columns that are likely duplicates.
@@ -44,35 +130,43 @@ def find_suspected_duplicate_columns(
 
     This function operates at the schema level and does not
     evaluate semantic or clinical equivalence.
+
+    backend selects the name similarity metric: "rapidfuzz" (Indel ratio,
+    default) or "difflib_fast" (Ratcliff-Obershelp ratio, requires the
+    optional difflib_fast package).
     """
     if "missing_pct" not in missing_df.columns:
         raise ValueError("missing_df must contain a 'missing_pct' column")
 
-    suspects = []
-
-    for col1, col2 in combinations(df.columns, 2):
-
-        if col1 not in missing_df.index or col2 not in missing_df.index:
-            continue
-
-        sim = column_name_similarity(col1, col2)
-
-        if sim < similarity_threshold:
-            continue
-
-        miss1 = missing_df.loc[col1, "missing_pct"]
-        miss2 = missing_df.loc[col2, "missing_pct"]
-
-        if miss1 >= missing_threshold or miss2 >= missing_threshold:
-            suspects.append({
-                "column_1": col1,
-                "column_2": col2,
-                "similarity": round(sim, 3),
-                "missing_pct_1": round(miss1, 2),
-                "missing_pct_2": round(miss2, 2),
-            })
-
-    if not suspects:
+    # Only columns with known missing rates can be compared
+    columns = [col for col in df.columns if col in missing_df.index]
+
+    norm_names = [
+        normalize_column_name(col).base_name
+        for col in columns
+    ]
+
+    idx_1, idx_2, sim = _similar_name_pairs(
+        norm_names,
+        similarity_threshold,
+        backend=backend,
+    )
+
+    # Repeated labels keep their first rate so reindex never sees a
+    # duplicate axis
+    missing = (
+        missing_df["missing_pct"]
+        .groupby(level=0)
+        .first()
+        .reindex(columns)
+        .to_numpy()
+    )
+    miss_1 = missing[idx_1]
+    miss_2 = missing[idx_2]
+
+    is_suspect = (miss_1 >= missing_threshold) | (miss_2 >= missing_threshold)
+
+    if not is_suspect.any():
         return pd.DataFrame(
             columns=[
                 "column_1",
@@ -83,10 +177,20 @@ def find_suspected_duplicate_columns(
             ]
         )
 
+    names = np.asarray(columns, dtype=object)
+
+    suspects = pd.DataFrame({
+        "column_1": names[idx_1[is_suspect]],
+        "column_2": names[idx_2[is_suspect]],
+        "similarity": np.round(sim[is_suspect], 3),
+        "missing_pct_1": np.round(miss_1[is_suspect], 2),
+        "missing_pct_2": np.round(miss_2[is_suspect], 2),
+    })
+
     return (
-        pd.DataFrame(suspects)
+        suspects
         .sort_values(
             ["similarity", "missing_pct_1", "missing_pct_2"],
             ascending=False
         )
-    )
\ No newline at end of file
+    )